@@ -1,11 +1,14 @@
 import math
 import random
 import sys
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 
 import pygame
 
 BOARD_SIZE = 20
+BOARD_CELLS = BOARD_SIZE * BOARD_SIZE
 VIEW_SIZE = 3
 CELL_SIZE = 24
 MARGIN = 30
@@ -29,33 +32,74 @@ DIRECTIONS = {
     "right": (1, 0),
 }
 
+# Pre-decoded vectors for the hot loops: the four viewport steps and the
+# four line axes. DIRECTIONS stays as the name -> vector map for input
+# handling only.
+VIEW_STEPS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+AXES = ((1, 0), (0, 1), (1, 1), (1, -1))
 
-@dataclass
+WIN_SCORE = 1_000_000
+MAX_SEARCH_DEPTH = 6
+CPU_TIME_BUDGET_MS = 12
+THREAT_RADIUS = 3
+
+
+def idx(x: int, y: int) -> int:
+    return y * BOARD_SIZE + x
+
+
+def _column_mask(min_x: int, max_x: int) -> int:
+    mask = 0
+    for y in range(BOARD_SIZE):
+        for x in range(min_x, max_x + 1):
+            mask |= 1 << idx(x, y)
+    return mask
+
+
+# (shift, start-cell mask) per axis: a 3-in-a-row starting at a given bit
+# spans bits i, i+shift, i+2*shift, and the mask keeps starts that would
+# wrap around a row edge from counting as wins.
+WIN_SHIFTS = (
+    (1, _column_mask(0, BOARD_SIZE - 3)),
+    (BOARD_SIZE, (1 << BOARD_CELLS) - 1),
+    (BOARD_SIZE + 1, _column_mask(0, BOARD_SIZE - 3)),
+    (BOARD_SIZE - 1, _column_mask(2, BOARD_SIZE - 1)),
+)
+
+
+@dataclass(slots=True)
 class GameState:
-    board: list
+    board_x: int
+    board_o: int
     view_x: int
     view_y: int
     current: str
     awaiting_place: bool
-    strip_cells: list
+    strip_cells: tuple
+    player_threats: set
+    cpu_thinking: bool
     game_over: bool
     winner: str | None
     message: str
+    dirty: bool
 
 
 def new_game() -> GameState:
-    board = [[None for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
     start = (BOARD_SIZE - VIEW_SIZE) // 2
     return GameState(
-        board=board,
+        board_x=0,
+        board_o=0,
         view_x=start,
         view_y=start,
         current="X",
         awaiting_place=False,
-        strip_cells=[],
+        strip_cells=(),
+        player_threats=set(),
+        cpu_thinking=False,
         game_over=False,
         winner=None,
         message="",
+        dirty=True,
     )
 
 
@@ -71,163 +115,361 @@ def viewport_cells(view_x: int, view_y: int) -> list:
     ]
 
 
-def revealed_strip(old_x: int, old_y: int, new_x: int, new_y: int) -> list:
+def _build_strip_table() -> tuple:
+    # STRIP_TABLE[d][new_x][new_y] -> the 3 cells a viewport move reveals,
+    # for d = 0 right, 1 left, 2 down, 3 up. Every reachable strip is a
+    # preallocated tuple, so revealed_strip never builds lists.
+    span = BOARD_SIZE - VIEW_SIZE + 1
+    table = []
+    for d in range(4):
+        per_x = []
+        for nx in range(span):
+            per_y = []
+            for ny in range(span):
+                if d == 0:
+                    cells = tuple((nx + VIEW_SIZE - 1, ny + dy) for dy in range(VIEW_SIZE))
+                elif d == 1:
+                    cells = tuple((nx, ny + dy) for dy in range(VIEW_SIZE))
+                elif d == 2:
+                    cells = tuple((nx + dx, ny + VIEW_SIZE - 1) for dx in range(VIEW_SIZE))
+                else:
+                    cells = tuple((nx + dx, ny) for dx in range(VIEW_SIZE))
+                per_y.append(cells)
+            per_x.append(tuple(per_y))
+        table.append(tuple(per_x))
+    return tuple(table)
+
+
+STRIP_TABLE = _build_strip_table()
+
+
+def revealed_strip(old_x: int, old_y: int, new_x: int, new_y: int) -> tuple:
     if new_x > old_x:
-        col = new_x + VIEW_SIZE - 1
-        return [(col, new_y + dy) for dy in range(VIEW_SIZE)]
-    if new_x < old_x:
-        col = new_x
-        return [(col, new_y + dy) for dy in range(VIEW_SIZE)]
-    if new_y > old_y:
-        row = new_y + VIEW_SIZE - 1
-        return [(new_x + dx, row) for dx in range(VIEW_SIZE)]
-    if new_y < old_y:
-        row = new_y
-        return [(new_x + dx, row) for dx in range(VIEW_SIZE)]
-    return []
+        d = 0
+    elif new_x < old_x:
+        d = 1
+    elif new_y > old_y:
+        d = 2
+    elif new_y < old_y:
+        d = 3
+    else:
+        return ()
+    return STRIP_TABLE[d][new_x][new_y]
 
 
-def empty_cells(board: list, cells: list) -> list:
-    return [cell for cell in cells if board[cell[1]][cell[0]] is None]
+def stone_at(board_x: int, board_o: int, x: int, y: int) -> str | None:
+    bit = idx(x, y)
+    if (board_x >> bit) & 1:
+        return "X"
+    if (board_o >> bit) & 1:
+        return "O"
+    return None
 
 
-def check_winner(board: list) -> str | None:
-    for y in range(BOARD_SIZE):
-        for x in range(BOARD_SIZE):
-            symbol = board[y][x]
-            if symbol is None:
-                continue
-            for dx, dy in [(1, 0), (0, 1), (1, 1), (1, -1)]:
-                if all(
-                    in_bounds(x + i * dx, y + i * dy)
-                    and board[y + i * dy][x + i * dx] == symbol
-                    for i in range(3)
-                ):
-                    return symbol
+def empty_cells(board_x: int, board_o: int, cells: tuple) -> list:
+    occupied = board_x | board_o
+    return [cell for cell in cells if not (occupied >> idx(cell[0], cell[1])) & 1]
+
+
+def check_winner(board_x: int, board_o: int) -> str | None:
+    for bb, symbol in ((board_x, "X"), (board_o, "O")):
+        for shift, mask in WIN_SHIFTS:
+            if bb & (bb >> shift) & (bb >> (2 * shift)) & mask:
+                return symbol
     return None
 
 
-def immediate_win_cells(board: list, symbol: str) -> set:
+def count_run(bb: int, x: int, y: int, dx: int, dy: int, size: int = BOARD_SIZE) -> int:
+    # Unrolled to two steps: a run longer than 2 on one side of a cell
+    # cannot change a 3-in-a-row test, so there is no loop to mispredict.
+    # Bounds tests are inlined (and size bound locally) to skip the
+    # global lookups of in_bounds/idx on the hottest path in the search.
+    nx = x + dx
+    ny = y + dy
+    if not (0 <= nx < size and 0 <= ny < size and (bb >> (ny * size + nx)) & 1):
+        return 0
+    nx += dx
+    ny += dy
+    if not (0 <= nx < size and 0 <= ny < size and (bb >> (ny * size + nx)) & 1):
+        return 1
+    return 2
+
+
+def check_winner_at(bb: int, x: int, y: int) -> bool:
+    for dx, dy in AXES:
+        if 1 + count_run(bb, x, y, dx, dy) + count_run(bb, x, y, -dx, -dy) >= 3:
+            return True
+    return False
+
+
+# The bitboards are plain ints, so they double as exact cache keys: the
+# same position always hashes the same and adjacent CPU decisions share
+# most of the board.
+@lru_cache(maxsize=8192)
+def immediate_win_cells(board_x: int, board_o: int, symbol: str) -> frozenset:
     wins = set()
+    bb = board_x if symbol == "X" else board_o
+    occupied = board_x | board_o
     for y in range(BOARD_SIZE):
         for x in range(BOARD_SIZE):
-            if board[y][x] is not None:
+            bit = 1 << idx(x, y)
+            if occupied & bit:
                 continue
-            board[y][x] = symbol
-            if check_winner(board) == symbol:
+            if check_winner_at(bb | bit, x, y):
                 wins.add((x, y))
-            board[y][x] = None
-    return wins
+    return frozenset(wins)
+
+
+def update_threats(state: GameState, px: int, py: int) -> None:
+    # A placement only changes would-win status for cells near it, so
+    # re-test just the window around the new stone and leave the rest of
+    # state.player_threats untouched.
+    occupied = state.board_x | state.board_o
+    for cy in range(max(0, py - THREAT_RADIUS), min(BOARD_SIZE, py + THREAT_RADIUS + 1)):
+        for cx in range(max(0, px - THREAT_RADIUS), min(BOARD_SIZE, px + THREAT_RADIUS + 1)):
+            cell = (cx, cy)
+            state.player_threats.discard(cell)
+            bit = 1 << idx(cx, cy)
+            if occupied & bit:
+                continue
+            if check_winner_at(state.board_x | bit, cx, cy):
+                state.player_threats.add(cell)
 
 
-def line_score(board: list, x: int, y: int, symbol: str) -> int:
+@lru_cache(maxsize=8192)
+def line_score(bb: int, x: int, y: int) -> int:
     score = 0
-    for dx, dy in [(1, 0), (0, 1), (1, 1), (1, -1)]:
-        count = 1
-        for direction in (1, -1):
-            step = 1
-            while True:
-                nx = x + dx * step * direction
-                ny = y + dy * step * direction
-                if not in_bounds(nx, ny):
-                    break
-                if board[ny][nx] != symbol:
-                    break
-                count += 1
-                step += 1
+    for dx, dy in AXES:
+        count = 1 + count_run(bb, x, y, dx, dy) + count_run(bb, x, y, -dx, -dy)
         score += count * count
     return score
 
 
-def center_bias(x: int, y: int) -> float:
-    center = (BOARD_SIZE - 1) / 2
-    dist = math.hypot(x - center, y - center)
-    return -dist
+_CENTER = (BOARD_SIZE - 1) / 2
+CENTER_BIAS = tuple(
+    -math.hypot(x - _CENTER, y - _CENTER)
+    for y in range(BOARD_SIZE)
+    for x in range(BOARD_SIZE)
+)
 
 
-def evaluate_move(board: list, move: str, view_x: int, view_y: int) -> tuple:
-    dx, dy = DIRECTIONS[move]
-    new_x = view_x + dx
-    new_y = view_y + dy
-    strip = revealed_strip(view_x, view_y, new_x, new_y)
-    empties = empty_cells(board, strip)
-    placements = empties or [None]
-
-    cpu_symbol = "O"
-    player_symbol = "X"
-    player_wins = immediate_win_cells(board, player_symbol)
+def center_bias(x: int, y: int) -> float:
+    return CENTER_BIAS[y * BOARD_SIZE + x]
+
+
+@lru_cache(maxsize=8192)
+def evaluate_position(board_x: int, board_o: int) -> float:
+    score = 0.0
+    for bb, sign in ((board_o, 1), (board_x, -1)):
+        stones = bb
+        while stones:
+            bit = stones & -stones
+            i = bit.bit_length() - 1
+            x = i % BOARD_SIZE
+            y = i // BOARD_SIZE
+            score += sign * (line_score(bb, x, y) * 8 + center_bias(x, y) * 5)
+            stones ^= bit
+    return score
 
-    best_score = -1e9
-    best_placements = []
 
-    for placement in placements:
-        score = 0
+def child_moves(board_x: int, board_o: int, view_x: int, view_y: int, is_cpu: bool) -> list:
+    bb = board_o if is_cpu else board_x
+    children = []
+    for dx, dy in VIEW_STEPS:
+        nx = view_x + dx
+        ny = view_y + dy
+        if not (0 <= nx <= BOARD_SIZE - VIEW_SIZE and 0 <= ny <= BOARD_SIZE - VIEW_SIZE):
+            continue
+        strip = revealed_strip(view_x, view_y, nx, ny)
+        empties = empty_cells(board_x, board_o, strip)
+        if not empties:
+            children.append((0, nx, ny, None))
+            continue
+        for px, py in empties:
+            order = line_score(bb | (1 << idx(px, py)), px, py)
+            children.append((order, nx, ny, (px, py)))
+    children.sort(key=lambda child: child[0], reverse=True)
+    return children
+
+
+def alphabeta(
+    board_x: int,
+    board_o: int,
+    view_x: int,
+    view_y: int,
+    depth: int,
+    alpha: float,
+    beta: float,
+    is_cpu: bool,
+) -> float:
+    if depth == 0:
+        return evaluate_position(board_x, board_o)
+    best = -math.inf if is_cpu else math.inf
+    if depth == 1:
+        # Every child is a leaf, so ordering buys nothing: evaluate each
+        # move in place with unpacked scalars instead of building and
+        # sorting the per-move tuples of child_moves.
+        limit = BOARD_SIZE - VIEW_SIZE
+        for dx, dy in VIEW_STEPS:
+            nx = view_x + dx
+            ny = view_y + dy
+            if not (0 <= nx <= limit and 0 <= ny <= limit):
+                continue
+            empties = empty_cells(
+                board_x, board_o, revealed_strip(view_x, view_y, nx, ny)
+            )
+            if empties:
+                for px, py in empties:
+                    bit = 1 << idx(px, py)
+                    if is_cpu:
+                        child_o = board_o | bit
+                        if check_winner_at(child_o, px, py):
+                            score = float(WIN_SCORE + depth)
+                        else:
+                            score = evaluate_position(board_x, child_o)
+                        if score > best:
+                            best = score
+                            if best >= beta:
+                                return best
+                    else:
+                        child_x = board_x | bit
+                        if check_winner_at(child_x, px, py):
+                            score = float(-(WIN_SCORE + depth))
+                        else:
+                            score = evaluate_position(child_x, board_o)
+                        if score < best:
+                            best = score
+                            if best <= alpha:
+                                return best
+            else:
+                score = evaluate_position(board_x, board_o)
+                if is_cpu:
+                    if score > best:
+                        best = score
+                        if best >= beta:
+                            return best
+                elif score < best:
+                    best = score
+                    if best <= alpha:
+                        return best
+        return best
+    for _, nx, ny, placement in child_moves(board_x, board_o, view_x, view_y, is_cpu):
         if placement:
             px, py = placement
-            board[py][px] = cpu_symbol
-            if check_winner(board) == cpu_symbol:
-                score = 1_000_000
+            bit = 1 << idx(px, py)
+            child_x = board_x | bit if not is_cpu else board_x
+            child_o = board_o | bit if is_cpu else board_o
+            if check_winner_at(child_o if is_cpu else child_x, px, py):
+                score = WIN_SCORE + depth if is_cpu else -(WIN_SCORE + depth)
             else:
+                score = alphabeta(child_x, child_o, nx, ny, depth - 1, alpha, beta, not is_cpu)
+        else:
+            score = alphabeta(board_x, board_o, nx, ny, depth - 1, alpha, beta, not is_cpu)
+        if is_cpu:
+            if score > best:
+                best = score
+            if best > alpha:
+                alpha = best
+        else:
+            if score < best:
+                best = score
+            if best < beta:
+                beta = best
+        if alpha >= beta:
+            break
+    return best
+
+
+def search_root(
+    state: GameState, children: list, depth: int, player_wins: set, deadline: int
+) -> tuple:
+    best_score = -math.inf
+    chosen = None
+    tie_count = 0
+    for _, nx, ny, placement in children:
+        # Depth 1 is a handful of leaf evaluations and must always finish:
+        # it is the fallback move when every deeper pass times out, so an
+        # already-blown deadline (scheduler stall, render contention) must
+        # not leave the CPU without a turn to play.
+        if depth > 1 and pygame.time.get_ticks() > deadline:
+            return best_score, None
+        if placement:
+            px, py = placement
+            child_o = state.board_o | (1 << idx(px, py))
+            if check_winner_at(child_o, px, py):
+                score = float(WIN_SCORE + depth)
+            else:
+                score = alphabeta(
+                    state.board_x, child_o, nx, ny, depth - 1, -math.inf, math.inf, False
+                )
                 if placement in player_wins:
                     score += 200_000
-                score += line_score(board, px, py, cpu_symbol) * 8
-                score += line_score(board, px, py, player_symbol) * 3
-                score += center_bias(px, py) * 5
-            board[py][px] = None
         else:
-            score -= 200
-
-        score += center_bias(new_x + 1, new_y + 1) * 2
-
+            score = alphabeta(
+                state.board_x, state.board_o, nx, ny, depth - 1, -math.inf, math.inf, False
+            ) - 200
         if score > best_score:
             best_score = score
-            best_placements = [placement]
+            chosen = (nx, ny, placement)
+            tie_count = 1
         elif score == best_score:
-            best_placements.append(placement)
-
-    placement_choice = random.choice(best_placements)
-    return best_score, (new_x, new_y), strip, placement_choice
+            # Reservoir selection: each of the k tied moves ends up chosen
+            # with probability 1/k without accumulating a candidate list.
+            tie_count += 1
+            if random.random() * tie_count < 1.0:
+                chosen = (nx, ny, placement)
+    return best_score, chosen
 
 
 def cpu_take_turn(state: GameState) -> None:
-    best_score = -1e9
-    candidates = []
-    for move in DIRECTIONS:
-        dx, dy = DIRECTIONS[move]
-        new_x = state.view_x + dx
-        new_y = state.view_y + dy
-        if not (0 <= new_x <= BOARD_SIZE - VIEW_SIZE and 0 <= new_y <= BOARD_SIZE - VIEW_SIZE):
-            continue
-        score, (nx, ny), strip, placement = evaluate_move(
-            state.board, move, state.view_x, state.view_y
-        )
-        if score > best_score:
-            best_score = score
-            candidates = [(nx, ny, strip, placement)]
-        elif score == best_score:
-            candidates.append((nx, ny, strip, placement))
-
-    if not candidates:
+    player_wins = state.player_threats
+    children = child_moves(state.board_x, state.board_o, state.view_x, state.view_y, True)
+    if not children:
         return
 
-    nx, ny, strip, placement = random.choice(candidates)
-    state.view_x = nx
-    state.view_y = ny
-    state.strip_cells = strip
+    deadline = pygame.time.get_ticks() + CPU_TIME_BUDGET_MS
+    chosen = None
+    for depth in range(1, MAX_SEARCH_DEPTH + 1):
+        best_score, depth_choice = search_root(state, children, depth, player_wins, deadline)
+        if depth_choice is None:
+            break
+        chosen = depth_choice
+        # Put this depth's best move first so the next, deeper pass gets
+        # near-optimal ordering (and the cheapest possible cutoffs).
+        children.sort(key=lambda child: child[1:] != chosen)
+        if best_score >= WIN_SCORE or pygame.time.get_ticks() > deadline:
+            break
+
+    if chosen is None:
+        return
 
+    # Work out the whole turn in locals, then publish it to the state in
+    # one locked block so a frame can never render a half-applied move.
+    nx, ny, placement = chosen
+    strip = revealed_strip(state.view_x, state.view_y, nx, ny)
+    new_o = state.board_o
+    cpu_won = False
     if placement:
         px, py = placement
-        state.board[py][px] = "O"
-        winner = check_winner(state.board)
-        if winner:
+        new_o |= 1 << idx(px, py)
+        cpu_won = check_winner_at(new_o, px, py)
+
+    with _state_lock:
+        state.view_x = nx
+        state.view_y = ny
+        state.board_o = new_o
+        state.dirty = True
+        if cpu_won:
+            state.strip_cells = strip
             state.game_over = True
-            state.winner = winner
+            state.winner = "O"
             state.message = "CPU wins!"
             return
-
-    state.current = "X"
-    state.awaiting_place = False
-    state.strip_cells = []
+        if placement:
+            update_threats(state, px, py)
+        state.current = "X"
+        state.awaiting_place = False
+        state.strip_cells = ()
 
 
 def move_view(state: GameState, move: str) -> bool:
@@ -240,7 +482,8 @@ def move_view(state: GameState, move: str) -> bool:
     state.view_x = new_x
     state.view_y = new_y
     state.strip_cells = strip
-    empties = empty_cells(state.board, strip)
+    state.dirty = True
+    empties = empty_cells(state.board_x, state.board_o, strip)
     if empties:
         state.awaiting_place = True
     else:
@@ -248,14 +491,27 @@ def move_view(state: GameState, move: str) -> bool:
     return True
 
 
+# Taken by the CPU worker while publishing its move and by the main loop
+# while drawing, so a frame never renders a half-applied turn.
+_state_lock = threading.Lock()
+
+
+def _cpu_worker(state: GameState) -> None:
+    cpu_take_turn(state)
+    state.cpu_thinking = False
+    state.dirty = True
+
+
 def end_turn(state: GameState) -> None:
     if state.game_over:
         return
     state.awaiting_place = False
-    state.strip_cells = []
+    state.strip_cells = ()
     if state.current == "X":
         state.current = "O"
-        cpu_take_turn(state)
+        state.cpu_thinking = True
+        state.dirty = True
+        threading.Thread(target=_cpu_worker, args=(state,), daemon=True).start()
     else:
         state.current = "X"
 
@@ -276,18 +532,106 @@ def handle_player_click(state: GameState, pos: tuple) -> None:
     cell = (grid_x, grid_y)
     if cell not in state.strip_cells:
         return
-    if state.board[grid_y][grid_x] is not None:
+    if stone_at(state.board_x, state.board_o, grid_x, grid_y) is not None:
         return
-    state.board[grid_y][grid_x] = "X"
-    winner = check_winner(state.board)
-    if winner:
+    state.board_x |= 1 << idx(grid_x, grid_y)
+    state.dirty = True
+    if check_winner_at(state.board_x, grid_x, grid_y):
         state.game_over = True
-        state.winner = winner
+        state.winner = "X"
         state.message = "You win!"
         return
+    update_threats(state, grid_x, grid_y)
     end_turn(state)
 
 
+_text_cache: dict[str, pygame.Surface] = {}
+
+
+def text_surf(font: pygame.font.Font, line: str) -> pygame.Surface:
+    surf = _text_cache.get(line)
+    if surf is None:
+        surf = _text_cache[line] = font.render(line, True, TEXT_COLOR)
+    return surf
+
+
+X_SURF: pygame.Surface | None = None
+O_SURF: pygame.Surface | None = None
+GRID_SURF: pygame.Surface | None = None
+
+
+def build_sprites() -> None:
+    global X_SURF, O_SURF, GRID_SURF
+    padding = 5
+    X_SURF = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+    pygame.draw.line(
+        X_SURF, X_COLOR, (padding, padding), (CELL_SIZE - padding, CELL_SIZE - padding), 2
+    )
+    pygame.draw.line(
+        X_SURF, X_COLOR, (padding, CELL_SIZE - padding), (CELL_SIZE - padding, padding), 2
+    )
+    O_SURF = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+    pygame.draw.circle(
+        O_SURF, O_COLOR, (CELL_SIZE // 2, CELL_SIZE // 2), CELL_SIZE // 2 - 5, 2
+    )
+    GRID_SURF = pygame.Surface(
+        (BOARD_SIZE * CELL_SIZE, BOARD_SIZE * CELL_SIZE), pygame.SRCALPHA
+    )
+    for y in range(BOARD_SIZE):
+        for x in range(BOARD_SIZE):
+            rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+            pygame.draw.rect(GRID_SURF, GRID_COLOR, rect, 1)
+
+
+_panel_sig: tuple | None = None
+_panel_surf: pygame.Surface | None = None
+
+
+def panel_surface(state: GameState, font: pygame.font.Font) -> pygame.Surface:
+    global _panel_sig, _panel_surf
+    sig = (
+        state.current,
+        state.view_x,
+        state.view_y,
+        state.awaiting_place,
+        state.cpu_thinking,
+        state.game_over,
+        state.message,
+    )
+    if sig == _panel_sig:
+        return _panel_surf
+
+    lines = [
+        "Tic-Tac-Shift",
+        "",
+        f"Turn: {'You (X)' if state.current == 'X' else 'CPU (O)'}",
+        f"Viewport: ({state.view_x}, {state.view_y})",
+        "",
+        "Controls:",
+        "Arrow / WASD: move",
+        "Mouse: place in strip",
+        "R: restart",
+        "ESC: quit",
+    ]
+    if state.awaiting_place and state.current == "X":
+        lines.insert(3, "Place in highlighted strip!")
+
+    if state.cpu_thinking:
+        lines.insert(3, "CPU thinking...")
+
+    if state.game_over:
+        lines.insert(2, state.message or "Game Over")
+
+    surf = pygame.Surface((SIDE_PANEL - 30, 280), pygame.SRCALPHA)
+    pygame.draw.rect(surf, PANEL_COLOR, pygame.Rect(0, 0, SIDE_PANEL - 30, 260))
+    for i, line in enumerate(lines):
+        surf.blit(text_surf(font, line), (0, 10 + i * 22))
+
+    _panel_sig = sig
+    _panel_surf = surf
+    return surf
+
+
 def draw_board(screen: pygame.Surface, state: GameState, font: pygame.font.Font) -> None:
     screen.fill(BG_COLOR)
     board_left = MARGIN
@@ -304,40 +648,20 @@ def draw_board(screen: pygame.Surface, state: GameState, font: pygame.font.Font)
         ),
     )
 
-    for y in range(BOARD_SIZE):
-        for x in range(BOARD_SIZE):
-            rect = pygame.Rect(
-                board_left + x * CELL_SIZE,
-                board_top + y * CELL_SIZE,
-                CELL_SIZE,
-                CELL_SIZE,
+    screen.blit(GRID_SURF, (board_left, board_top))
+    for bb, sprite in ((state.board_x, X_SURF), (state.board_o, O_SURF)):
+        stones = bb
+        while stones:
+            bit = stones & -stones
+            i = bit.bit_length() - 1
+            screen.blit(
+                sprite,
+                (
+                    board_left + (i % BOARD_SIZE) * CELL_SIZE,
+                    board_top + (i // BOARD_SIZE) * CELL_SIZE,
+                ),
             )
-            pygame.draw.rect(screen, GRID_COLOR, rect, 1)
-            symbol = state.board[y][x]
-            if symbol == "X":
-                padding = 5
-                pygame.draw.line(
-                    screen,
-                    X_COLOR,
-                    (rect.left + padding, rect.top + padding),
-                    (rect.right - padding, rect.bottom - padding),
-                    2,
-                )
-                pygame.draw.line(
-                    screen,
-                    X_COLOR,
-                    (rect.left + padding, rect.bottom - padding),
-                    (rect.right - padding, rect.top + padding),
-                    2,
-                )
-            elif symbol == "O":
-                pygame.draw.circle(
-                    screen,
-                    O_COLOR,
-                    rect.center,
-                    CELL_SIZE // 2 - 5,
-                    2,
-                )
+            stones ^= bit
 
     view_rect = pygame.Rect(
         board_left + state.view_x * CELL_SIZE,
@@ -357,30 +681,7 @@ def draw_board(screen: pygame.Surface, state: GameState, font: pygame.font.Font)
         pygame.draw.rect(screen, STRIP_COLOR, rect, 3)
 
     panel_x = board_left + BOARD_SIZE * CELL_SIZE + 20
-    panel_rect = pygame.Rect(panel_x, board_top - 10, SIDE_PANEL - 30, 260)
-    pygame.draw.rect(screen, PANEL_COLOR, panel_rect)
-
-    lines = [
-        "Tic-Tac-Shift",
-        "", 
-        f"Turn: {'You (X)' if state.current == 'X' else 'CPU (O)'}",
-        f"Viewport: ({state.view_x}, {state.view_y})",
-        "", 
-        "Controls:",
-        "Arrow / WASD: move",
-        "Mouse: place in strip",
-        "R: restart",
-        "ESC: quit",
-    ]
-    if state.awaiting_place and state.current == "X":
-        lines.insert(3, "Place in highlighted strip!")
-
-    if state.game_over:
-        lines.insert(2, state.message or "Game Over")
-
-    for i, line in enumerate(lines):
-        text = font.render(line, True, TEXT_COLOR)
-        screen.blit(text, (panel_x, board_top + i * 22))
+    screen.blit(panel_surface(state, font), (panel_x, board_top - 10))
 
 
 def main() -> None:
@@ -389,6 +690,7 @@ def main() -> None:
     pygame.display.set_caption("Tic-Tac-Shift")
     font = pygame.font.SysFont(None, 22)
     clock = pygame.time.Clock()
+    build_sprites()
     state = new_game()
 
     running = True
@@ -413,8 +715,14 @@ def main() -> None:
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 handle_player_click(state, event.pos)
 
-        draw_board(screen, state, font)
-        pygame.display.flip()
+        # Keep drawing at full rate while the CPU thinks, and clear the
+        # flag *before* drawing so a concurrent set by the worker is
+        # never clobbered after the fact.
+        if state.dirty or state.cpu_thinking:
+            state.dirty = False
+            with _state_lock:
+                draw_board(screen, state, font)
+            pygame.display.flip()
         clock.tick(60)
 
     pygame.quit()